@@ -5,6 +5,7 @@ Usage:
 .. code-block:: bash
 
     python -m scripts.run_loop --goal "Fix failing tests"
+    python -m scripts.run_loop --goals-file nightly.jsonl --workers 4
 
 This script instantiates the agent memory, ensures directories exist, and
 runs the agent loop for the given goal.  It is a thin wrapper around
@@ -18,24 +19,36 @@ import argparse
 import logging
 
 from self_editing_ai.src import config
+from self_editing_ai.src.agent.batch import format_summary, load_goals, run_batch
 from self_editing_ai.src.agent.loop import AgentLoop
 from self_editing_ai.src.agent.memory import Memory
 
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Run the self‑editing AI agent loop")
-    parser.add_argument(
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument(
         "--goal",
         type=str,
-        required=True,
         help="Goal for the agent to accomplish",
     )
+    target.add_argument(
+        "--goals-file",
+        type=str,
+        help="JSONL file of goals to run as a batch",
+    )
     parser.add_argument(
         "--max-steps",
         type=int,
         default=None,
         help="Maximum number of iterations before stopping",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of worker processes for --goals-file",
+    )
     return parser.parse_args()
 
 
@@ -44,6 +57,13 @@ def main() -> None:
     logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
     config.ensure_directories()
     memory = Memory()
+    if args.goals_file:
+        jobs = load_goals(args.goals_file)
+        for job in jobs:
+            if job.max_steps is None:
+                job.max_steps = args.max_steps
+        print(format_summary(run_batch(jobs, workers=args.workers, memory=memory)))
+        return
     agent = AgentLoop(memory=memory)
     agent.run(goal=args.goal, max_steps=args.max_steps)
 
@@ -0,0 +1,256 @@
+"""Run a queue of goals in parallel worker processes.
+
+Each goal is executed by a fresh ``AgentLoop`` in its own process, against a
+private copy of the project tree, so concurrent goals can neither see nor
+clobber each other's edits.  Workers keep their messages in an in‑memory
+SQLite database and hand them back to the parent, which is the only process
+that writes to the shared memory database.  This avoids SQLite lock
+contention entirely, regardless of the number of workers.
+
+Goals are read from a JSONL file.  Each line is either a JSON string or an
+object with a ``goal`` key and optional ``id`` and ``max_steps`` keys::
+
+    {"id": "nightly-1", "goal": "Fix failing tests", "max_steps": 5}
+    "Add a web search tool"
+"""
+
+from __future__ import annotations
+
+import contextlib
+import io
+import json
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import logging
+
+from .. import config
+from . import policies
+from .memory import Memory
+
+
+logger = logging.getLogger(__name__)
+
+# Files and directories that are never copied into a goal's workspace:
+# version control, snapshots, local databases, virtualenvs and tool caches
+# (mirroring ``.gitignore``).
+WORKSPACE_IGNORE: Tuple[str, ...] = (
+    ".git",
+    ".snapshots",
+    "__pycache__",
+    "*.sqlite3",
+    "*.zip",
+    "vector_store",
+    ".venv",
+    "venv",
+    "node_modules",
+    ".pytest_cache",
+    ".mypy_cache",
+    ".ruff_cache",
+    ".tox",
+    ".nox",
+    "*.egg-info",
+)
+
+# Name under which the project is importable.  Each goal's copy of the tree
+# is placed in a directory of this name so that prepending its parent to
+# ``PYTHONPATH`` makes ``import self_editing_ai`` resolve to the copy.
+PACKAGE_NAME: str = "self_editing_ai"
+
+# The project tree itself: the directory containing ``src`` and ``tests``.
+PROJECT_ROOT: Path = Path(config.__file__).resolve().parents[1]
+
+
+@dataclass
+class GoalJob:
+    """A single goal read from the goals file."""
+
+    goal_id: str
+    goal: str
+    max_steps: Optional[int] = None
+
+
+@dataclass
+class GoalResult:
+    """Outcome of running one goal in a worker process."""
+
+    goal_id: str
+    goal: str
+    outcome: str  # "passed", "failed" or "error"
+    duration: float
+    error: Optional[str] = None
+    messages: List[Tuple[str, str, Dict[str, Any]]] = field(default_factory=list)
+
+
+def load_goals(path: str | Path) -> List[GoalJob]:
+    """Parse a JSONL goals file.
+
+    :raises ValueError: if a line is not valid JSON, lacks a goal or reuses an id
+    """
+    jobs: List[GoalJob] = []
+    seen: set[str] = set()
+    with Path(path).open("r", encoding="utf-8") as f:
+        for lineno, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError as exc:
+                raise ValueError(f"{path}:{lineno}: invalid JSON: {exc}") from exc
+            if isinstance(entry, str):
+                entry = {"goal": entry}
+            if not isinstance(entry, dict) or not entry.get("goal"):
+                raise ValueError(f"{path}:{lineno}: expected a goal string or an object with a 'goal' key")
+            goal_id = str(entry.get("id", f"goal-{lineno}"))
+            if goal_id in seen:
+                raise ValueError(f"{path}:{lineno}: duplicate goal id {goal_id!r}")
+            seen.add(goal_id)
+            jobs.append(GoalJob(goal_id=goal_id, goal=entry["goal"], max_steps=entry.get("max_steps")))
+    return jobs
+
+
+def _prepare_workspace(root: Path, project_root: Path | None = None) -> Path:
+    """Copy the project tree into ``root`` and return the copy's path.
+
+    The copy is named :data:`PACKAGE_NAME` so that prepending ``root`` to
+    ``PYTHONPATH`` makes test subprocesses import the isolated code.
+    Symlinks are copied as links, so dangling links do not abort the copy.
+
+    :param root: temporary directory that receives the copy
+    :param project_root: tree to copy; defaults to :data:`PROJECT_ROOT`
+    """
+    dest = root / PACKAGE_NAME
+    shutil.copytree(
+        project_root or PROJECT_ROOT,
+        dest,
+        symlinks=True,
+        ignore=shutil.ignore_patterns(*WORKSPACE_IGNORE),
+    )
+    return dest
+
+
+def _run_goal(
+    job: GoalJob, keep_workspace: bool = False, project_root: Path | None = None
+) -> GoalResult:
+    """Worker entry point: run one goal in an isolated copy of the tree."""
+    from .loop import AgentLoop
+    from .snapshots import SnapshotStore
+
+    start = time.perf_counter()
+    root = Path(tempfile.mkdtemp(prefix="self_editing_ai-goal-"))
+    memory = Memory(Path(":memory:"))
+    # Pool processes are reused across goals, so restore what we change
+    saved_cwd = os.getcwd()
+    saved_pythonpath = os.environ.get("PYTHONPATH")
+    saved_allowed = list(policies.ALLOWED_DIRS)
+    try:
+        workspace_dir = _prepare_workspace(root, project_root)
+        os.chdir(workspace_dir)
+        os.environ["PYTHONPATH"] = os.pathsep.join(p for p in (str(root), saved_pythonpath) if p)
+        # Confine this process to its own copy of the tree
+        policies.ALLOWED_DIRS[:] = [workspace_dir]
+        agent = AgentLoop(memory=memory, snapshots=SnapshotStore(workspace_dir / ".snapshots"))
+        with contextlib.redirect_stdout(io.StringIO()):
+            passed = agent.run(goal=job.goal, max_steps=job.max_steps)
+        outcome, error = ("passed" if passed else "failed"), None
+    except Exception as exc:  # report rather than kill the whole batch
+        logger.exception("Goal %s raised an exception", job.goal_id)
+        outcome, error = "error", f"{type(exc).__name__}: {exc}"
+    finally:
+        os.chdir(saved_cwd)
+        if saved_pythonpath is None:
+            os.environ.pop("PYTHONPATH", None)
+        else:
+            os.environ["PYTHONPATH"] = saved_pythonpath
+        policies.ALLOWED_DIRS[:] = saved_allowed
+        if keep_workspace:
+            logger.info("Kept workspace for goal %s at %s", job.goal_id, root)
+        else:
+            shutil.rmtree(root, ignore_errors=True)
+    messages = [(role, content, meta) for _, role, content, meta in memory.all_messages()]
+    return GoalResult(
+        goal_id=job.goal_id,
+        goal=job.goal,
+        outcome=outcome,
+        duration=time.perf_counter() - start,
+        error=error,
+        messages=messages,
+    )
+
+
+def run_batch(
+    jobs: List[GoalJob],
+    workers: int = 1,
+    memory: Memory | None = None,
+    keep_workspaces: bool = False,
+    project_root: Path | None = None,
+) -> List[GoalResult]:
+    """Run ``jobs`` in a process pool and record results in ``memory``.
+
+    The calling process is the single writer to the memory database: each
+    result is written, with its goal id attached to every message, as soon
+    as its worker finishes.
+
+    :param jobs: goals to run
+    :param workers: number of worker processes
+    :param memory: shared memory database; defaults to ``Memory()``
+    :param keep_workspaces: leave each goal's temporary tree on disk
+    :param project_root: tree each goal works on a copy of; defaults to
+        :data:`PROJECT_ROOT`
+    :returns: results in the order the goals were given
+    """
+    memory = memory or Memory()
+    results: Dict[str, GoalResult] = {}
+    with ProcessPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = {pool.submit(_run_goal, job, keep_workspaces, project_root): job for job in jobs}
+        for future in as_completed(futures):
+            job = futures[future]
+            try:
+                result = future.result()
+            except Exception as exc:  # e.g. the worker process died
+                result = GoalResult(job.goal_id, job.goal, "error", 0.0, error=f"{type(exc).__name__}: {exc}")
+            results[job.goal_id] = result
+            memory.append_messages(
+                (role, content, {**meta, "goal_id": result.goal_id})
+                for role, content, meta in result.messages
+            )
+            memory.append_message(
+                "system",
+                f"Goal {result.goal_id} {result.outcome} in {result.duration:.1f}s",
+                metadata={
+                    "type": "batch_result",
+                    "goal_id": result.goal_id,
+                    "outcome": result.outcome,
+                    "duration": result.duration,
+                    "error": result.error,
+                },
+            )
+            logger.info("Goal %s %s in %.1fs", result.goal_id, result.outcome, result.duration)
+    return [results[job.goal_id] for job in jobs]
+
+
+def format_summary(results: List[GoalResult]) -> str:
+    """Return a human readable table of per‑goal timings and outcomes."""
+    width = max([len(r.goal_id) for r in results] + [4])
+    lines = [f"{'goal':<{width}}  {'outcome':<7}  {'seconds':>8}"]
+    for r in results:
+        line = f"{r.goal_id:<{width}}  {r.outcome:<7}  {r.duration:>8.1f}"
+        if r.error:
+            line += f"  {r.error}"
+        lines.append(line)
+    counts: Dict[str, int] = {}
+    for r in results:
+        counts[r.outcome] = counts.get(r.outcome, 0) + 1
+    totals = ", ".join(f"{n} {outcome}" for outcome, n in sorted(counts.items()))
+    lines.append(f"{len(results)} goals: {totals}; {sum(r.duration for r in results):.1f}s total worker time")
+    return "\n".join(lines)
+
+
+__all__ = ["GoalJob", "GoalResult", "load_goals", "run_batch", "format_summary"]
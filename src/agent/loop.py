@@ -9,16 +9,21 @@ own planning and editing logic.
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Optional
+import asyncio
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable, Optional
 
 import logging
 
 from .. import config
 from .memory import Memory
+from .pipeline import PipelineResult, Proposer, run_pipeline
+from .snapshots import Snapshot, SnapshotStore
 from .tests_runner import run_tests
 from .tools import read_file, write_file
 from .policies import is_path_allowed
+from .workspace import Workspace, default_workspace
 
 
 logger = logging.getLogger(__name__)
@@ -29,8 +34,38 @@ class AgentLoop:
     """Orchestrates the planning/editing/testing/reviewing loop."""
 
     memory: Memory
+    snapshots: SnapshotStore = field(default_factory=SnapshotStore)
+    workspace: Workspace = field(default_factory=default_workspace)
 
-    def run(self, goal: str, max_steps: Optional[int] = None) -> None:
+    def checkpoint(self, paths: Iterable[str | Path]) -> Snapshot:
+        """Record the files an edit is about to touch so it can be reverted.
+
+        :param paths: files the pending edit will create or modify
+        :returns: the snapshot to pass to :meth:`revert` if the edit is rejected
+        """
+        snapshot = self.snapshots.snapshot(paths)
+        self.memory.append_message(
+            "system",
+            f"Checkpoint {snapshot.snapshot_id}",
+            metadata={"type": "checkpoint", "files": sorted(snapshot.files)},
+        )
+        return snapshot
+
+    def revert(self, snapshot: Snapshot | str) -> None:
+        """Restore the files recorded by :meth:`checkpoint` to their exact bytes."""
+        if isinstance(snapshot, str):
+            snapshot = self.snapshots.load(snapshot)
+        self.snapshots.restore(snapshot)
+        self.workspace.invalidate(snapshot.files)
+        snapshot_id = snapshot.snapshot_id
+        logger.info("Reverted edit to checkpoint %s", snapshot_id[:12])
+        self.memory.append_message(
+            "system",
+            f"Reverted to checkpoint {snapshot_id}",
+            metadata={"type": "revert"},
+        )
+
+    def run(self, goal: str, max_steps: Optional[int] = None) -> bool:
         """Run the agent loop to achieve the given goal.
 
         The current implementation logs the goal and stores it in memory,
@@ -40,17 +75,20 @@ class AgentLoop:
 
         :param goal: the user‑supplied objective
         :param max_steps: maximum number of iterations; defaults to config.MAX_STEPS
+        :returns: True if the test suite passes when the loop finishes
         """
         max_steps = max_steps or config.MAX_STEPS
         logger.info("Starting agent loop for goal: %s", goal)
         # Record the goal in memory
         self.memory.append_message("user", goal, metadata={"type": "goal"})
         # Example: run tests once before editing
-        passed, output = run_tests()
+        outcome = run_tests(memory=self.memory)
+        passed, output = outcome
+        self.workspace.mark_tested()
         self.memory.append_message(
             "system",
             f"Initial test run {'passed' if passed else 'failed'}:\n{output}",
-            metadata={"type": "test_result"},
+            metadata={"type": "test_result", "usage": outcome.usage},
         )
         # Log and print output for the user
         if passed:
@@ -62,6 +100,28 @@ class AgentLoop:
         logger.info(
             "AgentLoop.run() completed after 1 iteration.  Extend this method to implement planning/editing."
         )
+        return passed
+
+    def run_pipelined(
+        self,
+        goal: str,
+        propose: Proposer,
+        max_steps: Optional[int] = None,
+        time_budget: Optional[float] = None,
+    ) -> PipelineResult:
+        """Run the goal with speculative drafting overlapped with test runs.
+
+        See :func:`agent.pipeline.run_pipeline`.  ``propose`` is an async
+        callable standing in for the planner/editor.
+
+        :param goal: the user‑supplied objective
+        :param propose: async proposer returning the next candidate or None
+        :param max_steps: maximum number of candidates; defaults to config.MAX_STEPS
+        :param time_budget: seconds for the whole goal; defaults to config.TIME_BUDGET
+        """
+        logger.info("Starting pipelined agent loop for goal: %s", goal)
+        self.memory.append_message("user", goal, metadata={"type": "goal"})
+        return asyncio.run(run_pipeline(self, goal, propose, max_steps, time_budget))
 
 
 __all__ = ["AgentLoop"]
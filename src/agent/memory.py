@@ -52,6 +52,15 @@ class Memory:
             );
             """
         )
+        cur.execute(
+            """
+            CREATE TABLE IF NOT EXISTS test_results (
+                cache_key TEXT PRIMARY KEY,
+                passed INTEGER NOT NULL,
+                output TEXT NOT NULL
+            );
+            """
+        )
         self.conn.commit()
 
     def append_message(self, role: str, content: str, metadata: Optional[Dict[str, Any]] = None) -> None:
@@ -69,6 +78,37 @@ class Memory:
         )
         self.conn.commit()
 
+    def append_messages(self, messages: Iterable[Tuple[str, str, Optional[Dict[str, Any]]]]) -> None:
+        """Append several ``(role, content, metadata)`` messages in one transaction.
+
+        This is the write path used when a single process collects results
+        from many workers, so the database only ever sees one writer.
+        """
+        rows = [(role, content, json.dumps(metadata or {})) for role, content, metadata in messages]
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO messages (role, content, metadata) VALUES (?, ?, ?)",
+                rows,
+            )
+
+    def get_test_result(self, cache_key: str) -> Optional[Tuple[bool, str]]:
+        """Return the cached ``(passed, output)`` for ``cache_key``, if any."""
+        cur = self.conn.cursor()
+        cur.execute("SELECT passed, output FROM test_results WHERE cache_key = ?", (cache_key,))
+        row = cur.fetchone()
+        if row is None:
+            return None
+        return bool(row[0]), row[1]
+
+    def put_test_result(self, cache_key: str, passed: bool, output: str) -> None:
+        """Store the outcome of a test run under ``cache_key``."""
+        cur = self.conn.cursor()
+        cur.execute(
+            "INSERT OR REPLACE INTO test_results (cache_key, passed, output) VALUES (?, ?, ?)",
+            (cache_key, int(passed), output),
+        )
+        self.conn.commit()
+
     def all_messages(self) -> List[Tuple[int, str, str, Dict[str, Any]]]:
         """Return all stored messages as a list of tuples.
 
@@ -0,0 +1,232 @@
+"""Pipelined, speculative execution of the edit/test loop.
+
+In the sequential loop, the time spent drafting a candidate edit and the time
+spent testing it add up on every step.  The pipelined loop overlaps them:
+while candidate N is being tested in a subprocess, the proposer is already
+drafting candidate N+1 from the attempts seen so far (with N's result still
+pending).  If N is accepted, the speculative draft is cancelled; if N is
+rejected, N is reverted and the draft is applied immediately.
+
+Planning and editing are supplied by the caller as a *proposer*: an async
+callable that receives the goal and the attempt history and returns the next
+:class:`Candidate`, or ``None`` to give up.  The most recent attempt in the
+history may still be under test; its ``passed`` field is filled in on the
+same object once the result arrives, so a proposer can poll it.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, List, Optional
+
+import logging
+
+from .. import config
+from .tests_runner import run_tests_async
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .loop import AgentLoop
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Candidate:
+    """A proposed edit: the full new contents of each file it touches."""
+
+    files: Dict[str, str]
+    rationale: str = ""
+
+
+@dataclass
+class Attempt:
+    """A candidate together with its test outcome (``None`` while pending).
+
+    ``usage`` is the resource usage of the test process, if one ran.
+    """
+
+    step: int
+    candidate: Candidate
+    passed: Optional[bool] = None
+    output: str = ""
+    usage: Optional[Dict[str, Any]] = None
+
+
+Proposer = Callable[[str, List[Attempt]], Awaitable[Optional[Candidate]]]
+
+
+@dataclass
+class PipelineStats:
+    """Accounting of speculative drafting work."""
+
+    drafts_used: int = 0
+    drafts_wasted: int = 0
+    seconds_used: float = 0.0
+    seconds_wasted: float = 0.0
+
+
+@dataclass
+class PipelineResult:
+    """Outcome of a pipelined run."""
+
+    accepted: Optional[Attempt]
+    attempts: List[Attempt] = field(default_factory=list)
+    stats: PipelineStats = field(default_factory=PipelineStats)
+    stop_reason: str = ""
+
+
+class _Draft:
+    """A running proposer call that remembers how long it has been working."""
+
+    def __init__(
+        self, propose: Proposer, goal: str, history: List[Attempt], speculative: bool = False
+    ) -> None:
+        self.speculative = speculative
+        self.started = time.perf_counter()
+        self.finished: Optional[float] = None
+        self.task = asyncio.ensure_future(self._run(propose, goal, list(history)))
+
+    async def _run(self, propose: Proposer, goal: str, history: List[Attempt]) -> Optional[Candidate]:
+        try:
+            return await propose(goal, history)
+        finally:
+            self.finished = time.perf_counter()
+
+    @property
+    def elapsed(self) -> float:
+        return (self.finished or time.perf_counter()) - self.started
+
+    async def cancel(self) -> None:
+        self.task.cancel()
+        try:
+            await self.task
+        except BaseException:  # cancelled, or the proposer itself failed
+            pass
+
+
+async def run_pipeline(
+    agent: "AgentLoop",
+    goal: str,
+    propose: Proposer,
+    max_steps: Optional[int] = None,
+    time_budget: Optional[float] = None,
+) -> PipelineResult:
+    """Run the speculative propose/apply/test loop for ``goal``.
+
+    Each candidate is checkpointed and written through ``agent.workspace``,
+    tested with :func:`run_tests_async`, and either accepted (tests pass) or
+    reverted.  At most ``max_steps`` candidates are tested and nothing is
+    started once ``time_budget`` seconds have elapsed; in‑flight work is
+    cancelled (and an in‑flight candidate reverted) when the budget runs out.
+
+    :param agent: supplies memory, snapshots and the workspace
+    :param goal: the user‑supplied objective
+    :param propose: async proposer producing the next candidate
+    :param max_steps: defaults to ``config.MAX_STEPS``
+    :param time_budget: seconds; defaults to ``config.TIME_BUDGET``
+    """
+    max_steps = max_steps or config.MAX_STEPS
+    time_budget = time_budget or config.TIME_BUDGET
+    deadline = time.perf_counter() + time_budget
+    result = PipelineResult(accepted=None)
+    stats = result.stats
+    attempts = result.attempts
+
+    def remaining() -> float:
+        return deadline - time.perf_counter()
+
+    draft: Optional[_Draft] = _Draft(propose, goal, attempts)
+    try:
+        for step in range(1, max_steps + 1):
+            assert draft is not None
+            try:
+                candidate = await asyncio.wait_for(asyncio.shield(draft.task), max(remaining(), 0))
+            except asyncio.TimeoutError:
+                result.stop_reason = "time budget exhausted while drafting"
+                break
+            if draft.speculative:
+                stats.drafts_used += 1
+                stats.seconds_used += draft.elapsed
+            draft = None
+            if candidate is None:
+                result.stop_reason = "proposer gave up"
+                break
+
+            attempt = Attempt(step=step, candidate=candidate)
+            attempts.append(attempt)
+            denied = [p for p in candidate.files if not agent.workspace.is_allowed(p)]
+            if denied:
+                attempt.passed = False
+                attempt.output = f"Rejected: editing {', '.join(denied)} is not permitted by policy"
+                _record(agent, attempt)
+                if step < max_steps:
+                    draft = _Draft(propose, goal, attempts)
+                continue
+            snapshot = agent.checkpoint(candidate.files)
+            agent.workspace.write_many(candidate.files)
+
+            test_task = asyncio.ensure_future(run_tests_async(memory=agent.memory))
+            if step < max_steps:
+                # Speculate: draft the next candidate while this one is tested
+                draft = _Draft(propose, goal, attempts, speculative=True)
+            try:
+                outcome = await asyncio.wait_for(test_task, max(remaining(), 0))
+            except asyncio.TimeoutError:
+                agent.revert(snapshot)
+                attempt.passed, attempt.output = False, "time budget exhausted while testing"
+                _record(agent, attempt)
+                result.stop_reason = "time budget exhausted while testing"
+                break
+            except BaseException:
+                agent.revert(snapshot)
+                raise
+            attempt.passed, attempt.output = outcome
+            attempt.usage = outcome.usage
+            agent.workspace.mark_tested()
+            _record(agent, attempt)
+            if attempt.passed:
+                result.accepted = attempt
+                result.stop_reason = "candidate accepted"
+                break
+            agent.revert(snapshot)
+        else:
+            result.stop_reason = "step budget exhausted"
+    finally:
+        if draft is not None:
+            await draft.cancel()
+            if draft.speculative:
+                stats.drafts_wasted += 1
+                stats.seconds_wasted += draft.elapsed
+    agent.memory.append_message(
+        "system",
+        f"Pipelined run finished after {len(attempts)} attempts: {result.stop_reason}",
+        metadata={
+            "type": "pipeline_stats",
+            "accepted_step": result.accepted.step if result.accepted else None,
+            "drafts_used": stats.drafts_used,
+            "drafts_wasted": stats.drafts_wasted,
+            "seconds_used": stats.seconds_used,
+            "seconds_wasted": stats.seconds_wasted,
+        },
+    )
+    return result
+
+
+def _record(agent: "AgentLoop", attempt: Attempt) -> None:
+    agent.memory.append_message(
+        "system",
+        f"Candidate {attempt.step} {'passed' if attempt.passed else 'failed'}:\n{attempt.output}",
+        metadata={
+            "type": "test_result",
+            "step": attempt.step,
+            "files": sorted(attempt.candidate.files),
+            "rationale": attempt.candidate.rationale,
+            "usage": attempt.usage,
+        },
+    )
+
+
+__all__ = ["Candidate", "Attempt", "Proposer", "PipelineStats", "PipelineResult", "run_pipeline"]
@@ -9,8 +9,10 @@ time the agent can spend on a single goal.
 from __future__ import annotations
 
 import fnmatch
+import os
+import re
 from pathlib import Path
-from typing import Iterable, List
+from typing import Dict, Iterable, List, Optional, Tuple
 
 from .. import config
 
@@ -27,6 +29,7 @@ DISALLOWED_PATTERNS: List[str] = [
     "*/.venv/*",
     "*/node_modules/*",
     "*/__pycache__/*",
+    "*/.snapshots/*",
 ]
 
 # Maximum number of bytes permitted in a single patch.  Large patches may
@@ -34,20 +37,70 @@ DISALLOWED_PATTERNS: List[str] = [
 MAX_PATCH_BYTES: int = 10_000
 
 
+class PathMatcher:
+    """Compiled allow/deny matcher with memoised per‑path decisions.
+
+    All disallowed patterns are compiled into a single regular expression.
+    Decisions are memoised by the *resolved* path, so each query costs one
+    ``realpath`` plus a dictionary lookup.  Because symlinks are resolved on
+    every call, replacing an approved path with a link that points outside the
+    allowed directories cannot reuse the earlier decision.
+    """
+
+    def __init__(self, allowed_dirs: Iterable[Path], disallowed_patterns: Iterable[str]) -> None:
+        self.allowed_dirs = tuple(Path(d).resolve() for d in allowed_dirs)
+        self.disallowed_patterns = tuple(disallowed_patterns)
+        self._deny = re.compile(
+            "|".join(fnmatch.translate(p) for p in self.disallowed_patterns) or r"(?!)"
+        )
+        self._decisions: Dict[str, bool] = {}
+
+    def __call__(self, path: str | Path) -> bool:
+        try:
+            key = os.path.realpath(path)
+        except Exception:
+            return False
+        decision = self._decisions.get(key)
+        if decision is None:
+            decision = self._decisions[key] = self._decide(Path(key))
+        return decision
+
+    def _decide(self, abs_path: Path) -> bool:
+        # Ensure the path is inside one of the allowed directories
+        if not any(abs_path.is_relative_to(allowed) for allowed in self.allowed_dirs):
+            return False
+        # Check against disallowed patterns
+        return self._deny.match(str(abs_path)) is None
+
+
+_matcher: Optional[PathMatcher] = None
+_matcher_key: Optional[Tuple[Tuple[Path, ...], Tuple[str, ...]]] = None
+
+
+def default_matcher() -> PathMatcher:
+    """Return a matcher for the module level allow/deny lists.
+
+    The matcher is rebuilt whenever ``ALLOWED_DIRS`` or ``DISALLOWED_PATTERNS``
+    have been modified, so user additions to those lists take effect.
+    """
+    global _matcher, _matcher_key
+    key = (tuple(ALLOWED_DIRS), tuple(DISALLOWED_PATTERNS))
+    if _matcher is None or key != _matcher_key:
+        _matcher = PathMatcher(*key)
+        _matcher_key = key
+    return _matcher
+
+
 def is_path_allowed(path: Path) -> bool:
     """Return True if the given path is allowed to be read or modified."""
-    try:
-        abs_path = path.resolve()
-    except Exception:
-        return False
-    # Ensure the path is inside one of the allowed directories
-    if not any(abs_path.is_relative_to(allowed) for allowed in ALLOWED_DIRS):
-        return False
-    # Check against disallowed patterns
-    for pattern in DISALLOWED_PATTERNS:
-        if fnmatch.fnmatch(str(abs_path), pattern):
-            return False
-    return True
+    return default_matcher()(path)
 
 
-__all__ = ["ALLOWED_DIRS", "DISALLOWED_PATTERNS", "MAX_PATCH_BYTES", "is_path_allowed"]
+__all__ = [
+    "ALLOWED_DIRS",
+    "DISALLOWED_PATTERNS",
+    "MAX_PATCH_BYTES",
+    "PathMatcher",
+    "default_matcher",
+    "is_path_allowed",
+]
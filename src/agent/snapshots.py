@@ -0,0 +1,133 @@
+"""Content‑addressed snapshots for accepting or reverting edits.
+
+Before the agent applies an edit it records the current bytes of every file
+the edit touches.  File contents are stored once as blobs named by their
+SHA‑256 digest, so repeated snapshots of unchanged files cost nothing beyond
+a hash.  A snapshot itself is a small JSON manifest mapping each path to its
+blob digest (or ``null`` if the file did not exist yet).
+
+Reverting restores the exact recorded bytes of the files in the manifest,
+so its cost is proportional to the number of files changed rather than the
+size of the tree, and it does not depend on git being available.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import logging
+
+from .. import config
+from .tools import atomic_write_many
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    """A recorded state of a set of files.
+
+    ``files`` maps absolute paths to blob digests; ``None`` marks a path that
+    did not exist when the snapshot was taken.
+    """
+
+    snapshot_id: str
+    files: Dict[str, Optional[str]]
+
+
+class SnapshotStore:
+    """Hash‑addressed blob store with JSON snapshot manifests."""
+
+    def __init__(self, root: Path | None = None) -> None:
+        self.root = Path(root or config.SNAPSHOT_DIR)
+        self.objects_dir = self.root / "objects"
+        self.manifests_dir = self.root / "manifests"
+
+    def _blob_path(self, digest: str) -> Path:
+        return self.objects_dir / digest[:2] / digest[2:]
+
+    def read_blob(self, digest: str) -> bytes:
+        """Return the bytes stored under ``digest``."""
+        return self._blob_path(digest).read_bytes()
+
+    def snapshot(self, paths: Iterable[str | Path]) -> Snapshot:
+        """Record the current contents of ``paths`` and return the snapshot.
+
+        Blobs that are already present in the store are not rewritten.  All
+        new blobs and the manifest are written in a single atomic batch.
+
+        :param paths: files that are about to be modified
+        :returns: the recorded :class:`Snapshot`
+        """
+        files: Dict[str, Optional[str]] = {}
+        pending: Dict[Path, bytes] = {}
+        for path in paths:
+            p = Path(path).resolve()
+            try:
+                data = p.read_bytes()
+            except FileNotFoundError:
+                files[str(p)] = None
+                continue
+            digest = hashlib.sha256(data).hexdigest()
+            files[str(p)] = digest
+            blob = self._blob_path(digest)
+            if not blob.exists():
+                pending[blob] = data
+        manifest = json.dumps(files, sort_keys=True).encode("utf-8")
+        snapshot_id = hashlib.sha256(manifest).hexdigest()
+        manifest_path = self.manifests_dir / f"{snapshot_id}.json"
+        if not manifest_path.exists():
+            pending[manifest_path] = manifest
+        if pending:
+            atomic_write_many(pending)
+        logger.debug("Recorded snapshot %s of %d files", snapshot_id[:12], len(files))
+        return Snapshot(snapshot_id=snapshot_id, files=files)
+
+    def load(self, snapshot_id: str) -> Snapshot:
+        """Load a previously recorded snapshot by its identifier.
+
+        :raises KeyError: if no snapshot with this identifier exists
+        """
+        manifest_path = self.manifests_dir / f"{snapshot_id}.json"
+        try:
+            files = json.loads(manifest_path.read_text(encoding="utf-8"))
+        except FileNotFoundError as exc:
+            raise KeyError(snapshot_id) from exc
+        return Snapshot(snapshot_id=snapshot_id, files=files)
+
+    def restore(self, snapshot: Snapshot | str) -> None:
+        """Restore every file in ``snapshot`` to its recorded bytes.
+
+        Files that did not exist when the snapshot was taken are removed.  All
+        blobs are read and verified before any file is touched, so a missing
+        or corrupt blob leaves the working tree unchanged.
+
+        :param snapshot: a :class:`Snapshot` or its identifier
+        :raises FileNotFoundError: if a blob is missing from the store
+        :raises RuntimeError: if a blob's contents do not match its digest
+        """
+        if isinstance(snapshot, str):
+            snapshot = self.load(snapshot)
+        writes: Dict[Path, bytes] = {}
+        removals: List[Path] = []
+        for path, digest in snapshot.files.items():
+            if digest is None:
+                removals.append(Path(path))
+                continue
+            data = self.read_blob(digest)
+            if hashlib.sha256(data).hexdigest() != digest:
+                raise RuntimeError(f"Snapshot blob {digest} is corrupt")
+            writes[Path(path)] = data
+        if writes:
+            atomic_write_many(writes)
+        for path in removals:
+            path.unlink(missing_ok=True)
+        logger.debug("Restored snapshot %s", snapshot.snapshot_id[:12])
+
+
+__all__ = ["Snapshot", "SnapshotStore"]
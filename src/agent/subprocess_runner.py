@@ -0,0 +1,280 @@
+"""Bounded, resource‑limited execution of subprocesses.
+
+Every command the agent runs (test suites, scripts) goes through
+:func:`run_bounded`.  Output is streamed through a head/tail ring buffer, so
+at most ``head_bytes + tail_bytes`` are ever held in memory no matter how much
+the process prints; the middle is elided.  CPU time, address space and open
+file descriptors are capped with ``setrlimit`` by a small trampoline that then
+``exec``s the command (no ``preexec_fn``, which is unsafe in threaded
+programs such as the asyncio pipeline), the child runs in its own process
+group, and that whole group is killed on timeout, on
+cancellation, and once the main process exits (so stray grandchildren cannot
+keep running or hold the output pipe open).  On Linux the child is also
+killed if the agent itself dies.  The resource usage of each run is
+reported in the returned :class:`ProcessResult`.
+"""
+
+from __future__ import annotations
+
+import os
+import selectors
+import signal
+import subprocess
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+import logging
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None  # type: ignore
+
+from .. import config
+
+
+logger = logging.getLogger(__name__)
+
+# Runs in the child, before the real command, as ``python -c _TRAMPOLINE cpu
+# mem nofile parent_pid cmd...``.  It applies the rlimits (0 = unlimited,
+# capped at the hard limit), then on Linux sets PR_SET_PDEATHSIG so the kernel
+# kills the child if the agent dies, and finally execs the command.  Both the
+# rlimits and the death signal survive exec.  The death signal is tied to the
+# thread that forked the child; that thread blocks in run_bounded until the
+# child is reaped, so it cannot exit first.  Killing one level of nested runs
+# (e.g. a test suite that runs the test suite) then tears down every level
+# below it as well.
+_TRAMPOLINE = """\
+import os, resource, sys
+cpu, mem, nofile, parent = (int(a) for a in sys.argv[1:5])
+for kind, value in ((resource.RLIMIT_CPU, cpu), (resource.RLIMIT_AS, mem), (resource.RLIMIT_NOFILE, nofile)):
+    if value:
+        hard = resource.getrlimit(kind)[1]
+        resource.setrlimit(kind, (value if hard == resource.RLIM_INFINITY else min(value, hard), hard))
+if sys.platform.startswith("linux"):
+    try:
+        import ctypes, signal
+        ctypes.CDLL(None).prctl(1, signal.SIGKILL)  # PR_SET_PDEATHSIG
+    except (OSError, AttributeError):
+        pass
+    if os.getppid() != parent:  # the agent died before prctl took effect
+        os._exit(1)
+os.execvp(sys.argv[5], sys.argv[5:])
+"""
+
+
+@dataclass(frozen=True)
+class Limits:
+    """Resource limits for a child process; ``None`` or 0 disables a limit."""
+
+    cpu_seconds: Optional[int] = None
+    memory_bytes: Optional[int] = None
+    max_open_files: Optional[int] = None
+
+    @classmethod
+    def from_config(cls) -> "Limits":
+        return cls(
+            cpu_seconds=config.SUBPROCESS_CPU_SECONDS,
+            memory_bytes=config.SUBPROCESS_MEMORY_MB * 1024 * 1024,
+            max_open_files=config.SUBPROCESS_MAX_OPEN_FILES,
+        )
+
+    def wrap(self, cmd: Sequence[str]) -> List[str]:
+        """Return ``cmd`` prefixed with a trampoline that applies the limits."""
+        if resource is None:  # pragma: no cover - no rlimits on this platform
+            return list(cmd)
+        values = (self.cpu_seconds, self.memory_bytes, self.max_open_files)
+        return [
+            sys.executable, "-I", "-S", "-c", _TRAMPOLINE,
+            *(str(v or 0) for v in values), str(os.getpid()), *cmd,
+        ]
+
+
+@dataclass
+class ProcessResult:
+    """Outcome and resource usage of a bounded subprocess run."""
+
+    returncode: Optional[int]
+    output: str
+    timed_out: bool
+    cancelled: bool
+    total_bytes: int
+    elided_bytes: int
+    wall_seconds: float
+    user_seconds: float = 0.0
+    system_seconds: float = 0.0
+    max_rss_kb: int = 0
+
+    def usage(self) -> Dict[str, Any]:
+        """Resource usage as a JSON‑serialisable dict, e.g. for message metadata."""
+        return {
+            "returncode": self.returncode,
+            "timed_out": self.timed_out,
+            "cancelled": self.cancelled,
+            "wall_seconds": round(self.wall_seconds, 3),
+            "user_seconds": round(self.user_seconds, 3),
+            "system_seconds": round(self.system_seconds, 3),
+            "max_rss_kb": self.max_rss_kb,
+            "total_bytes": self.total_bytes,
+            "elided_bytes": self.elided_bytes,
+        }
+
+    def usage_summary(self) -> str:
+        """One line describing how the process ended and what it used."""
+        if self.timed_out:
+            status = "timed out"
+        elif self.cancelled:
+            status = "cancelled"
+        else:
+            status = f"exit {self.returncode}"
+        return (
+            f"{status} after {self.wall_seconds:.2f}s wall, "
+            f"{self.user_seconds:.2f}s user, {self.system_seconds:.2f}s sys, "
+            f"max RSS {self.max_rss_kb / 1024:.1f} MiB, "
+            f"{self.total_bytes} output bytes ({self.elided_bytes} elided)"
+        )
+
+
+class HeadTailBuffer:
+    """Keeps the first ``head`` and last ``tail`` bytes of a stream."""
+
+    def __init__(self, head: int, tail: int) -> None:
+        self.head_limit = head
+        self.tail_limit = tail
+        self.head = bytearray()
+        self.tail = bytearray()
+        self.total = 0
+
+    def write(self, data: bytes) -> None:
+        self.total += len(data)
+        room = self.head_limit - len(self.head)
+        if room > 0:
+            self.head += data[:room]
+            data = data[room:]
+        if not data or self.tail_limit <= 0:
+            return
+        self.tail += data
+        # Trim lazily so that the amortised cost per byte stays constant
+        if len(self.tail) > 2 * self.tail_limit:
+            del self.tail[: len(self.tail) - self.tail_limit]
+
+    @property
+    def elided(self) -> int:
+        return self.total - len(self.head) - min(len(self.tail), self.tail_limit)
+
+    def getvalue(self) -> str:
+        tail = bytes(self.tail[-self.tail_limit :]) if self.tail_limit > 0 else b""
+        head = self.head.decode("utf-8", errors="replace")
+        if self.elided:
+            head += f"\n... [{self.elided} bytes elided] ...\n"
+        return head + tail.decode("utf-8", errors="replace")
+
+
+def _kill_group(pgid: int) -> None:
+    try:
+        os.killpg(pgid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+def run_bounded(
+    cmd: Sequence[str],
+    timeout: Optional[float] = None,
+    limits: Optional[Limits] = None,
+    head_bytes: Optional[int] = None,
+    tail_bytes: Optional[int] = None,
+    cwd: Optional[str | os.PathLike] = None,
+    env: Optional[Mapping[str, str]] = None,
+    cancel: Optional[threading.Event] = None,
+) -> ProcessResult:
+    """Run ``cmd`` with bounded output capture and resource limits.
+
+    stdout and stderr are merged into a single stream.
+
+    :param cmd: command and arguments
+    :param timeout: wall‑clock limit in seconds; defaults to config.TEST_TIMEOUT
+    :param limits: rlimits for the child; defaults to :meth:`Limits.from_config`
+    :param head_bytes: bytes kept from the start of the output
+    :param tail_bytes: bytes kept from the end of the output
+    :param cwd: working directory for the child
+    :param env: environment for the child
+    :param cancel: event that, when set, kills the process group early
+    :returns: a :class:`ProcessResult`
+    """
+    timeout = timeout or config.TEST_TIMEOUT
+    limits = limits or Limits.from_config()
+    buf = HeadTailBuffer(
+        config.OUTPUT_HEAD_BYTES if head_bytes is None else head_bytes,
+        config.OUTPUT_TAIL_BYTES if tail_bytes is None else tail_bytes,
+    )
+    start = time.perf_counter()
+    deadline = start + timeout
+    # process_group (3.11+) sets the group without running Python in the child
+    group = {"process_group": 0} if sys.version_info >= (3, 11) else {"start_new_session": True}
+    proc = subprocess.Popen(
+        limits.wrap(cmd),
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        stdin=subprocess.DEVNULL,
+        cwd=cwd,
+        env=dict(env) if env is not None else None,
+        **group,
+    )
+    timed_out = cancelled = eof = False
+    status: Optional[int] = None
+    rusage = None
+    assert proc.stdout is not None
+    fd = proc.stdout.fileno()
+    with selectors.DefaultSelector() as sel:
+        sel.register(fd, selectors.EVENT_READ)
+        while not (eof and status is not None):
+            now = time.perf_counter()
+            if now >= deadline:
+                timed_out = True
+                break
+            if cancel is not None and cancel.is_set():
+                cancelled = True
+                break
+            wait = min(0.1, deadline - now)
+            if eof:
+                time.sleep(wait)
+            elif sel.select(timeout=wait):
+                chunk = os.read(fd, 65536)
+                if chunk:
+                    buf.write(chunk)
+                else:
+                    # Every process in the group has closed the pipe
+                    eof = True
+                    sel.unregister(fd)
+            if status is None:
+                pid, status, rusage = os.wait4(proc.pid, os.WNOHANG)
+                if pid == 0:
+                    status = None
+                else:
+                    # The main process is done; descendants must not outlive it
+                    _kill_group(proc.pid)
+    if status is None:
+        _kill_group(proc.pid)
+        _, status, rusage = os.wait4(proc.pid, 0)
+    proc.returncode = os.waitstatus_to_exitcode(status)
+    proc.stdout.close()
+    result = ProcessResult(
+        returncode=None if (timed_out or cancelled) else proc.returncode,
+        output=buf.getvalue(),
+        timed_out=timed_out,
+        cancelled=cancelled,
+        total_bytes=buf.total,
+        elided_bytes=buf.elided,
+        wall_seconds=time.perf_counter() - start,
+        user_seconds=rusage.ru_utime if rusage else 0.0,
+        system_seconds=rusage.ru_stime if rusage else 0.0,
+        max_rss_kb=rusage.ru_maxrss if rusage else 0,
+    )
+    logger.debug("%s: %s", cmd[0] if cmd else "", result.usage_summary())
+    return result
+
+
+__all__ = ["Limits", "ProcessResult", "HeadTailBuffer", "run_bounded"]
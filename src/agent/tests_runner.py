@@ -3,23 +3,68 @@
 This module defines a helper function to run the project's test suite in a
 subprocess.  The agent uses this to determine whether a candidate edit has
 improved or broken the code.  Test output is captured so that the agent can
-analyse failures and make informed revisions.
+analyse failures and make informed revisions.  Runs go through
+:func:`agent.subprocess_runner.run_bounded`, which bounds the captured output
+and the CPU time, memory and file descriptors the test process may use.
+
+When a :class:`~agent.memory.Memory` is supplied, outcomes are cached in it
+under a hash of the source tree and environment.  Re‑testing a tree state
+that has been seen before (for example after a revert) returns instantly.
 """
 
 from __future__ import annotations
 
-import subprocess
+import asyncio
+import hashlib
 import sys
+import threading
 from pathlib import Path
-from typing import Tuple
+from typing import Any, Dict, Optional, Tuple
 
 import logging
 
 from .. import config
+from .memory import Memory
+from .subprocess_runner import ProcessResult, run_bounded
+from .tree_hash import environment_fingerprint, tree_hash
 
 logger = logging.getLogger(__name__)
 
-def run_tests(test_path: str | Path = "tests", timeout: int | None = None) -> Tuple[bool, str]:
+
+class RunOutcome(tuple):
+    """``(passed, output)`` pair that also carries the run's resource usage.
+
+    It unpacks exactly like the plain tuple returned historically.  ``usage``
+    is :meth:`ProcessResult.usage` for the test process, or ``None`` when no
+    process ran (cached outcome, or pytest unavailable).
+    """
+
+    usage: Optional[Dict[str, Any]]
+
+    def __new__(cls, passed: bool, output: str, usage: Optional[Dict[str, Any]] = None) -> "RunOutcome":
+        outcome = super().__new__(cls, (passed, output))
+        outcome.usage = usage
+        return outcome
+
+
+def outcome_cache_key(test_path: str | Path = "tests") -> str:
+    """Return the cache key for running ``test_path`` against the current tree.
+
+    Like the test run itself, this treats the current working directory as
+    the project root: the key covers every hashed file under it and under
+    ``test_path``, together with the interpreter and installed dependency
+    versions.
+    """
+    roots = [Path.cwd(), Path(test_path)]
+    payload = "\n".join([tree_hash(roots), environment_fingerprint(), str(test_path)])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def run_tests(
+    test_path: str | Path = "tests",
+    timeout: int | None = None,
+    memory: Optional[Memory] = None,
+) -> RunOutcome:
     """
     Run the project's test suite and return a tuple of (passed, output).
 
@@ -29,12 +74,58 @@ def run_tests(test_path: str | Path = "tests", timeout: int | None = None) -> Tu
 
     :param test_path: directory or file to pass to the test runner
     :param timeout: optional timeout in seconds; defaults to config.TEST_TIMEOUT
+    :param memory: optional memory used to cache outcomes by tree hash
     :returns: a tuple `(passed, output)` where `passed` is True if all tests
               succeeded, and `output` is the combined stdout/stderr from the
-              test run.
+              test run.  It is a :class:`RunOutcome`, whose ``usage`` holds
+              the resource usage of the test process.
     """
     timeout = timeout or config.TEST_TIMEOUT
     python_exe = sys.executable
+    early, cache_key = _precheck(test_path, memory)
+    if early is not None:
+        return early
+    # Run pytest on the specified test path
+    cmd = [python_exe, "-m", "pytest", str(test_path), "-q"]
+    result = run_bounded(cmd, timeout=timeout)
+    return _finish(result, timeout, memory, cache_key)
+
+
+async def run_tests_async(
+    test_path: str | Path = "tests",
+    timeout: int | None = None,
+    memory: Optional[Memory] = None,
+) -> RunOutcome:
+    """Asynchronous variant of :func:`run_tests`.
+
+    The bounded runner executes in a worker thread so the event loop stays
+    free for other work (e.g. drafting the next candidate) while tests run.
+    Cancelling the coroutine kills the test process group.
+    """
+    timeout = timeout or config.TEST_TIMEOUT
+    early, cache_key = _precheck(test_path, memory)
+    if early is not None:
+        return early
+    cmd = [sys.executable, "-m", "pytest", str(test_path), "-q"]
+    cancel = threading.Event()
+    try:
+        result = await asyncio.to_thread(run_bounded, cmd, timeout=timeout, cancel=cancel)
+    except asyncio.CancelledError:
+        cancel.set()
+        raise
+    return _finish(result, timeout, memory, cache_key)
+
+
+def _precheck(
+    test_path: str | Path, memory: Optional[Memory]
+) -> Tuple[Optional[RunOutcome], Optional[str]]:
+    """Return ``(early_result, cache_key)`` for a test run about to start.
+
+    ``early_result`` is set when no test process is needed: either pytest is
+    unavailable or the outcome for this tree is already cached.  Otherwise
+    it is ``None`` and ``cache_key`` is the key to store the outcome under
+    (``None`` when no memory is given).
+    """
     # Prefer pytest if available; otherwise skip tests gracefully.
     try:
         import pytest  # noqa: F401  # attempt to import to detect availability
@@ -42,22 +133,29 @@ def run_tests(test_path: str | Path = "tests", timeout: int | None = None) -> Tu
         # pytest is not installed in this environment.  Skip running tests.
         msg = "pytest is not available; skipping tests"
         logger.warning(msg)
-        return False, msg
-    # Run pytest on the specified test path
-    cmd = [python_exe, "-m", "pytest", str(test_path), "-q"]
-    try:
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=timeout,
-            check=False,
-        )
-    except subprocess.TimeoutExpired:
+        return RunOutcome(False, msg), None
+    if memory is None:
+        return None, None
+    cache_key = outcome_cache_key(test_path)
+    cached = memory.get_test_result(cache_key)
+    if cached is not None:
+        logger.info("Using cached test outcome for tree %s", cache_key[:12])
+        return RunOutcome(*cached), cache_key
+    return None, cache_key
+
+
+def _finish(
+    result: ProcessResult, timeout: int, memory: Optional[Memory], cache_key: Optional[str]
+) -> RunOutcome:
+    """Turn a finished test process into a :class:`RunOutcome` and cache it."""
+    logger.info("Test run %s", result.usage_summary())
+    if result.timed_out:
         logger.error("test run timed out after %s seconds", timeout)
-        return False, f"Timeout after {timeout} seconds"
+        return RunOutcome(False, f"Timeout after {timeout} seconds\n{result.output}", result.usage())
     passed = result.returncode == 0
-    output = (result.stdout or "") + (result.stderr or "")
-    return passed, output
+    if cache_key is not None:
+        memory.put_test_result(cache_key, passed, result.output)
+    return RunOutcome(passed, result.output, result.usage())
+
 
-__all__ = ["run_tests"]
+__all__ = ["RunOutcome", "run_tests", "run_tests_async", "outcome_cache_key"]
@@ -9,14 +9,16 @@ from __future__ import annotations
 
 import json
 import os
+import stat
 import subprocess
 import sys
 from pathlib import Path
-from typing import Iterable, List
+from typing import Iterable, List, Mapping
 
 import logging
 
 from .. import config
+from .subprocess_runner import run_bounded
 
 
 logger = logging.getLogger(__name__)
@@ -43,52 +45,120 @@ def search_web(query: str, max_results: int = 5) -> List[str]:
 def read_file(path: str | Path) -> str:
     """Read the contents of a text file.
 
+    Reads go through the shared :func:`agent.workspace.default_workspace`, so
+    repeated reads of an unchanged file are served from memory.
+
     :param path: path to the file
     :returns: contents of the file as a string
     :raises FileNotFoundError: if the file does not exist
+    :raises PermissionError: if the path is denied by policy
     """
-    p = Path(path)
-    with p.open("r", encoding="utf-8") as f:
-        return f.read()
+    # Imported lazily: the workspace module builds on this one
+    from .workspace import default_workspace
+
+    return default_workspace().read(path)
 
 
 def write_file(path: str | Path, content: str) -> None:
     """Write the given content to a file, creating any parent directories.
 
+    The write is atomic: readers observe either the old or the new contents,
+    never a partially written file.  It goes through the shared
+    :func:`agent.workspace.default_workspace`, which caches the new contents
+    and marks the file dirty.
+
     :param path: path to the file
     :param content: text content to write
+    :raises PermissionError: if the path is denied by policy
     """
-    p = Path(path)
-    p.parent.mkdir(parents=True, exist_ok=True)
-    with p.open("w", encoding="utf-8") as f:
-        f.write(content)
+    from .workspace import default_workspace
+
+    default_workspace().write(path, content)
+
+
+def atomic_write_many(files: Mapping[Path, bytes]) -> None:
+    """Atomically replace several files with the given bytes.
+
+    Every file is first written to a temporary sibling and flushed to disk.
+    Only once all temporaries are durable are they renamed over their
+    targets, after which each affected directory is fsynced exactly once.
+    A multi‑file patch therefore costs one directory fsync per directory
+    rather than one per file, and a failure before the rename phase leaves
+    every target untouched.  If a rename fails, the temporaries not yet
+    renamed are removed.  Symlinks are followed, so the link is kept and its
+    target receives the new contents.
+
+    :param files: mapping of destination path to the bytes it should contain
+    """
+    staged: List[tuple[Path, Path]] = []
+    try:
+        for dest, data in files.items():
+            dest = Path(os.path.realpath(dest))
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            tmp = dest.with_name(f".{dest.name}.{os.getpid()}.tmp")
+            staged.append((tmp, dest))
+            with tmp.open("wb") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            try:
+                # Keep the permissions of the file being replaced
+                os.chmod(tmp, stat.S_IMODE(dest.stat().st_mode))
+            except FileNotFoundError:
+                pass
+    except BaseException:
+        for tmp, _ in staged:
+            tmp.unlink(missing_ok=True)
+        raise
+    renamed = 0
+    try:
+        for tmp, dest in staged:
+            os.replace(tmp, dest)
+            renamed += 1
+    except BaseException:
+        for tmp, _ in staged[renamed:]:
+            tmp.unlink(missing_ok=True)
+        raise
+    for directory in {dest.parent for _, dest in staged}:
+        _fsync_dir(directory)
+
+
+def _fsync_dir(directory: Path) -> None:
+    """Flush a directory entry so that renames inside it survive a crash."""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:  # pragma: no cover - e.g. platforms without directory fds
+        return
+    try:
+        os.fsync(fd)
+    except OSError:  # pragma: no cover
+        pass
+    finally:
+        os.close(fd)
 
 
 def run_python_file(path: str | Path, timeout: int = config.TEST_TIMEOUT) -> subprocess.CompletedProcess:
     """Execute a Python script and return the completed process object.
 
     This helper runs the script in a subprocess using the same Python
-    interpreter that is running the agent.  It captures stdout and stderr and
-    propagates the return code.  Use this for quick smoke tests or for
-    evaluating changes made to the agent.
+    interpreter that is running the agent.  The script runs under the
+    resource limits of :func:`agent.subprocess_runner.run_bounded`; its merged
+    stdout/stderr is returned in ``stdout``, with the middle elided if it is
+    very large.  Use this for quick smoke tests or for evaluating changes
+    made to the agent.
 
     :param path: path to the Python script to run
     :param timeout: maximum time (in seconds) to allow the script to run
     :returns: the ``subprocess.CompletedProcess`` instance
+    :raises subprocess.TimeoutExpired: if the script exceeds ``timeout``
     """
-    python_exe = sys.executable
-    try:
-        result = subprocess.run(
-            [python_exe, str(path)],
-            capture_output=True,
-            text=True,
-            timeout=timeout,
-            check=False,
-        )
-        return result
-    except subprocess.TimeoutExpired as e:
+    cmd = [sys.executable, str(path)]
+    result = run_bounded(cmd, timeout=timeout)
+    logger.info("Script %s %s", path, result.usage_summary())
+    if result.timed_out:
         logger.error("Script %s timed out after %s seconds", path, timeout)
-        raise
+        raise subprocess.TimeoutExpired(cmd, timeout, output=result.output)
+    return subprocess.CompletedProcess(cmd, result.returncode, stdout=result.output, stderr="")
 
 
 def embed_texts(texts: Iterable[str]) -> List[List[float]]:
@@ -112,6 +182,7 @@ __all__ = [
     "search_web",
     "read_file",
     "write_file",
+    "atomic_write_many",
     "run_python_file",
     "embed_texts",
 ]
@@ -0,0 +1,148 @@
+"""Merkle‑style hashing of the source tree for test result caching.
+
+A tree hash changes whenever any source, test or data file under the project
+changes, and stays the same when a revert restores an earlier state.
+Each directory's hash is derived from the sorted names and hashes of its
+children, and file digests are memoised by ``(mtime, size, inode)`` so that
+re‑hashing an unchanged tree costs one ``stat`` per file rather than reading
+every file again.
+
+The interpreter version and the set of installed distributions are folded
+into :func:`environment_fingerprint`, so upgrading a dependency invalidates
+cached outcomes as well.
+"""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+import importlib.metadata
+import os
+import sys
+from pathlib import Path
+from typing import AbstractSet, Dict, Iterable, Optional, Tuple
+
+from .. import config
+
+# File suffixes that never influence a test outcome.  Everything else is
+# hashed, since tests may read data files as well as source.  The configured
+# memory database is always excluded by path as well (see
+# :func:`_excluded_files`), whatever its name, because it changes on every
+# message.
+IGNORED_SUFFIXES: Tuple[str, ...] = (
+    ".pyc",
+    ".pyo",
+    ".sqlite3",
+    ".sqlite3-journal",
+    ".sqlite3-wal",
+    ".sqlite3-shm",
+    ".log",
+)
+
+# Directory names that are never descended into, in addition to hidden
+# directories such as ``.git``, ``.venv`` and ``.snapshots``.
+SKIPPED_DIRS: Tuple[str, ...] = (
+    "__pycache__",
+    "node_modules",
+    "venv",
+    "vector_store",
+)
+
+
+class FileHashCache:
+    """Per‑file digest cache validated by mtime, size and inode."""
+
+    def __init__(self) -> None:
+        self._digests: Dict[str, Tuple[Tuple[int, int, int], str]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def digest(self, path: str, st: os.stat_result) -> str:
+        stamp = (st.st_mtime_ns, st.st_size, st.st_ino)
+        cached = self._digests.get(path)
+        if cached is not None and cached[0] == stamp:
+            self.hits += 1
+            return cached[1]
+        self.misses += 1
+        h = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 16), b""):
+                h.update(chunk)
+        digest = h.hexdigest()
+        self._digests[path] = (stamp, digest)
+        return digest
+
+
+# Shared across calls so repeated test runs in one process reuse digests.
+default_file_cache = FileHashCache()
+
+
+def _excluded_files() -> AbstractSet[str]:
+    """Absolute paths of the memory database and its SQLite side files."""
+    db = os.path.abspath(config.MEMORY_DB_PATH)
+    return frozenset(db + suffix for suffix in ("", "-journal", "-wal", "-shm"))
+
+
+def _hash_dir(path: str, cache: FileHashCache, excluded: AbstractSet[str]) -> Optional[str]:
+    """Return the Merkle hash of ``path``, or None if it holds no hashed files."""
+    entries = []
+    with os.scandir(path) as it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name.startswith(".") or entry.name in SKIPPED_DIRS:
+                    continue
+                child = _hash_dir(entry.path, cache, excluded)
+                if child is not None:
+                    entries.append(f"d {entry.name} {child}")
+            elif (
+                not entry.name.endswith(IGNORED_SUFFIXES)
+                and entry.path not in excluded
+                and entry.is_file()
+            ):
+                entries.append(f"f {entry.name} {cache.digest(entry.path, entry.stat())}")
+    if not entries:
+        return None
+    entries.sort()
+    return hashlib.sha256("\n".join(entries).encode("utf-8")).hexdigest()
+
+
+def tree_hash(roots: Iterable[str | Path], cache: FileHashCache | None = None) -> str:
+    """Return a combined hash of the files under ``roots``.
+
+    :param roots: directories (or single files) to include
+    :param cache: per‑file digest cache; defaults to a module‑wide cache
+    """
+    cache = cache or default_file_cache
+    excluded = _excluded_files()
+    parts = []
+    for root in sorted({os.path.abspath(r) for r in roots}):
+        if os.path.isdir(root):
+            digest = _hash_dir(root, cache, excluded)
+        elif os.path.isfile(root) and root not in excluded:
+            digest = cache.digest(root, os.stat(root))
+        else:
+            digest = None
+        parts.append(f"{root} {digest}")
+    return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()
+
+
+@functools.lru_cache(maxsize=1)
+def environment_fingerprint() -> str:
+    """Hash of the interpreter and installed distribution versions."""
+    dists = sorted(
+        f"{dist.metadata['Name']}=={dist.version}"
+        for dist in importlib.metadata.distributions()
+        if dist.metadata["Name"]
+    )
+    payload = "\n".join([sys.executable, sys.version, *dists])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+__all__ = [
+    "IGNORED_SUFFIXES",
+    "SKIPPED_DIRS",
+    "FileHashCache",
+    "default_file_cache",
+    "tree_hash",
+    "environment_fingerprint",
+]
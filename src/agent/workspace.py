@@ -0,0 +1,138 @@
+"""Cached view of the agent's workspace files.
+
+Planning steps tend to read the same handful of files many times over.  The
+``Workspace`` class keeps their contents in memory and revalidates each entry
+with a single ``stat`` call (modification time, size and inode) instead of
+reading the file again.  Every access goes through one compiled allow/deny
+matcher whose decisions are memoised per path.
+
+Writes are applied atomically via :func:`agent.tools.atomic_write_many` and
+recorded in a dirty set, so the loop knows which files changed since the
+test suite last ran.
+
+:func:`agent.tools.read_file` and :func:`agent.tools.write_file` go through
+the process‑wide :func:`default_workspace`, which is also the default
+workspace of every ``AgentLoop``.
+"""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import Dict, Iterable, Mapping, Optional, Set, Tuple
+
+import logging
+
+from .policies import PathMatcher, default_matcher
+from .tools import atomic_write_many
+
+
+logger = logging.getLogger(__name__)
+
+
+class Workspace:
+    """In‑memory file cache validated by mtime, size and inode."""
+
+    def __init__(self, matcher: Optional[PathMatcher] = None) -> None:
+        self.matcher = matcher
+        # abspath -> ((mtime_ns, size, inode), text)
+        self._cache: Dict[str, Tuple[Tuple[int, int, int], str]] = {}
+        self._dirty: Set[Path] = set()
+        self.hits = 0
+        self.misses = 0
+
+    def is_allowed(self, path: str | Path) -> bool:
+        """Return True if policy permits reading and writing ``path``."""
+        return (self.matcher or default_matcher())(os.path.abspath(path))
+
+    def _check(self, path: str | Path) -> str:
+        key = os.path.abspath(path)
+        if not self.is_allowed(key):
+            raise PermissionError(f"Access to {path} is not permitted by policy")
+        return key
+
+    def read(self, path: str | Path) -> str:
+        """Return the text of ``path``, served from cache when unchanged.
+
+        :raises PermissionError: if the path is denied by policy
+        :raises FileNotFoundError: if the file does not exist
+        """
+        key = self._check(path)
+        st = os.stat(key)
+        # Atomic writes replace the inode, which catches rewrites that land
+        # within the filesystem's mtime granularity.
+        stamp = (st.st_mtime_ns, st.st_size, st.st_ino)
+        cached = self._cache.get(key)
+        if cached is not None and cached[0] == stamp:
+            self.hits += 1
+            return cached[1]
+        self.misses += 1
+        if cached is not None:
+            # Modified behind our back since it was cached
+            self._dirty.add(Path(key))
+        with open(key, "rb") as f:
+            data = f.read()
+        text = data.decode("utf-8")
+        self._cache[key] = (stamp, text)
+        return text
+
+    def read_many(self, paths: Iterable[str | Path]) -> Dict[Path, str]:
+        """Read several files at once, returning a mapping of path to text."""
+        return {Path(p): self.read(p) for p in paths}
+
+    def write(self, path: str | Path, content: str) -> None:
+        """Atomically write ``content`` to ``path`` and mark it dirty."""
+        self.write_many({path: content})
+
+    def write_many(self, files: Mapping[str | Path, str]) -> None:
+        """Atomically write several files as one batch and mark them dirty.
+
+        :raises PermissionError: if any path is denied by policy; nothing is
+            written in that case
+        """
+        files_text = {Path(self._check(p)): text for p, text in files.items()}
+        atomic_write_many({p: text.encode("utf-8") for p, text in files_text.items()})
+        for p in files_text:
+            key = str(p)
+            st = os.stat(key)
+            self._cache[key] = ((st.st_mtime_ns, st.st_size, st.st_ino), files_text[p])
+            self._dirty.add(p)
+
+    def invalidate(self, paths: Optional[Iterable[str | Path]] = None) -> None:
+        """Drop cached entries for ``paths`` (or everything) and mark them dirty.
+
+        Call this after files were changed without going through the
+        workspace, e.g. after a snapshot restore.
+        """
+        if paths is None:
+            self._dirty.update(Path(k) for k in self._cache)
+            self._cache.clear()
+            return
+        for p in paths:
+            key = os.path.abspath(p)
+            self._cache.pop(key, None)
+            self._dirty.add(Path(key))
+
+    @property
+    def dirty(self) -> Set[Path]:
+        """Files changed since the last call to :meth:`mark_tested`."""
+        return set(self._dirty)
+
+    def mark_tested(self) -> Set[Path]:
+        """Clear and return the dirty set; call after each test run."""
+        dirty, self._dirty = self._dirty, set()
+        return dirty
+
+
+_default: Optional[Workspace] = None
+
+
+def default_workspace() -> Workspace:
+    """Return the shared workspace backing ``tools.read_file``/``write_file``."""
+    global _default
+    if _default is None:
+        _default = Workspace()
+    return _default
+
+
+__all__ = ["Workspace", "default_workspace"]
@@ -2,7 +2,9 @@
 
 This module exposes a simple entry point that can be run with
 ``python -m src.cli --goal "<your goal>"``.  It instantiates the agent
-memory, prepares any required directories, and runs the agent loop.
+memory, prepares any required directories, and runs the agent loop.  With
+``--goals-file goals.jsonl --workers N`` a queue of goals is run in parallel
+worker processes and a per‑goal summary is printed at the end.
 """
 
 from __future__ import annotations
@@ -11,24 +13,36 @@ import argparse
 import logging
 
 from . import config
+from .agent.batch import format_summary, load_goals, run_batch
 from .agent.loop import AgentLoop
 from .agent.memory import Memory
 
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Run the self‑editing AI agent")
-    parser.add_argument(
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument(
         "--goal",
         type=str,
-        required=True,
         help="Goal or objective for the agent to accomplish",
     )
+    target.add_argument(
+        "--goals-file",
+        type=str,
+        help="JSONL file of goals to run as a batch",
+    )
     parser.add_argument(
         "--max-steps",
         type=int,
         default=None,
         help="Maximum number of iterations before giving up",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of worker processes for --goals-file",
+    )
     return parser.parse_args()
 
 
@@ -40,6 +54,14 @@ def main() -> None:
     config.ensure_directories()
     # Initialise memory
     memory = Memory()
+    if args.goals_file:
+        jobs = load_goals(args.goals_file)
+        for job in jobs:
+            if job.max_steps is None:
+                job.max_steps = args.max_steps
+        results = run_batch(jobs, workers=args.workers, memory=memory)
+        print(format_summary(results))
+        return
     loop = AgentLoop(memory=memory)
     loop.run(goal=args.goal, max_steps=args.max_steps)
 
@@ -25,6 +25,11 @@ VECTOR_STORE_DIR: Path = Path(
     os.getenv("SELF_EDITING_AI_VECTOR_STORE_DIR", BASE_DIR / "vector_store")
 )
 
+# Path to the content‑addressed snapshot store used to revert rejected edits.
+SNAPSHOT_DIR: Path = Path(
+    os.getenv("SELF_EDITING_AI_SNAPSHOT_DIR", BASE_DIR / ".snapshots")
+)
+
 # Maximum number of steps the agent will take before giving up on a goal.
 MAX_STEPS: int = int(os.getenv("SELF_EDITING_AI_MAX_STEPS", 20))
 
@@ -32,6 +37,20 @@ MAX_STEPS: int = int(os.getenv("SELF_EDITING_AI_MAX_STEPS", 20))
 # assume the patch introduced an infinite loop and revert.
 TEST_TIMEOUT: int = int(os.getenv("SELF_EDITING_AI_TEST_TIMEOUT", 30))
 
+# Limits applied to every subprocess the agent starts (tests, scripts).  Output
+# beyond OUTPUT_HEAD_BYTES + OUTPUT_TAIL_BYTES is elided from the middle so a
+# runaway process cannot exhaust the agent's memory.  Set a resource limit to
+# 0 to disable it.
+OUTPUT_HEAD_BYTES: int = int(os.getenv("SELF_EDITING_AI_OUTPUT_HEAD_BYTES", 32_768))
+OUTPUT_TAIL_BYTES: int = int(os.getenv("SELF_EDITING_AI_OUTPUT_TAIL_BYTES", 65_536))
+SUBPROCESS_CPU_SECONDS: int = int(os.getenv("SELF_EDITING_AI_SUBPROCESS_CPU_SECONDS", 120))
+SUBPROCESS_MEMORY_MB: int = int(os.getenv("SELF_EDITING_AI_SUBPROCESS_MEMORY_MB", 2048))
+SUBPROCESS_MAX_OPEN_FILES: int = int(os.getenv("SELF_EDITING_AI_SUBPROCESS_MAX_OPEN_FILES", 256))
+
+# Wall‑clock budget (in seconds) for working on a single goal.  The pipelined
+# loop stops drafting and testing candidates once it is exhausted.
+TIME_BUDGET: int = int(os.getenv("SELF_EDITING_AI_TIME_BUDGET", 600))
+
 # Model names or identifiers for the planner, editor and reviewer.  These
 # environment variables should be set to valid OpenAI model names (e.g.
 # "gpt-4") if you plan to use LLM‑based reasoning.  If left unset, the
@@ -50,8 +69,15 @@ __all__ = [
     "BASE_DIR",
     "MEMORY_DB_PATH",
     "VECTOR_STORE_DIR",
+    "SNAPSHOT_DIR",
     "MAX_STEPS",
     "TEST_TIMEOUT",
+    "TIME_BUDGET",
+    "OUTPUT_HEAD_BYTES",
+    "OUTPUT_TAIL_BYTES",
+    "SUBPROCESS_CPU_SECONDS",
+    "SUBPROCESS_MEMORY_MB",
+    "SUBPROCESS_MAX_OPEN_FILES",
     "PLANNER_MODEL",
     "EDITOR_MODEL",
     "REVIEWER_MODEL",
@@ -0,0 +1,81 @@
+"""Tests for batch goal parsing and single‑writer result recording."""
+
+from pathlib import Path
+
+import pytest
+
+from self_editing_ai.src.agent.batch import (
+    PACKAGE_NAME,
+    GoalJob,
+    GoalResult,
+    _prepare_workspace,
+    format_summary,
+    load_goals,
+    run_batch,
+)
+from self_editing_ai.src.agent.memory import Memory
+
+
+def test_load_goals_accepts_objects_and_strings(tmp_path: Path) -> None:
+    goals = tmp_path / "goals.jsonl"
+    goals.write_text(
+        '{"id": "a", "goal": "Fix tests", "max_steps": 3}\n\n"Add search"\n',
+        encoding="utf-8",
+    )
+    jobs = load_goals(goals)
+    assert [(j.goal_id, j.goal, j.max_steps) for j in jobs] == [
+        ("a", "Fix tests", 3),
+        ("goal-3", "Add search", None),
+    ]
+
+
+@pytest.mark.parametrize("line", ['{"id": "x"}', "not json", '{"id": "a", "goal": "g"}'])
+def test_load_goals_rejects_bad_lines(tmp_path: Path, line: str) -> None:
+    goals = tmp_path / "goals.jsonl"
+    goals.write_text('{"id": "a", "goal": "g"}\n' + line + "\n", encoding="utf-8")
+    with pytest.raises(ValueError):
+        load_goals(goals)
+
+
+def test_append_messages_and_summary(tmp_path: Path) -> None:
+    mem = Memory(tmp_path / "memory.sqlite3")
+    mem.append_messages([("user", "g", {"goal_id": "a"}), ("system", "ok", None)])
+    assert [m[1:3] for m in mem.all_messages()] == [("user", "g"), ("system", "ok")]
+
+    summary = format_summary(
+        [GoalResult("a", "g", "passed", 1.5), GoalResult("b", "h", "error", 0.2, error="boom")]
+    )
+    assert "boom" in summary
+    assert summary.splitlines()[-1].startswith("2 goals: 1 error, 1 passed")
+
+
+def test_run_batch_end_to_end(tmp_path: Path) -> None:
+    tree = tmp_path / "tree"
+    (tree / "tests").mkdir(parents=True)
+    (tree / "tests" / "test_ok.py").write_text("def test_ok():\n    assert True\n", encoding="utf-8")
+    before = sorted(str(p.relative_to(tree)) for p in tree.rglob("*"))
+
+    mem = Memory(tmp_path / "memory.sqlite3")
+    [result] = run_batch([GoalJob("only", "Keep tests green")], memory=mem, project_root=tree)
+
+    assert result.outcome == "passed", result.error
+    tagged = [(role, meta) for _, role, _, meta in mem.all_messages() if meta.get("goal_id") == "only"]
+    assert ("user", {"type": "goal", "goal_id": "only"}) in tagged
+    assert any(meta["type"] == "test_result" and meta["usage"]["returncode"] == 0 for _, meta in tagged)
+    assert any(meta["type"] == "batch_result" and meta["outcome"] == "passed" for _, meta in tagged)
+    assert sorted(str(p.relative_to(tree)) for p in tree.rglob("*")) == before
+
+
+def test_prepare_workspace_skips_venvs_and_keeps_symlinks(tmp_path: Path) -> None:
+    tree = tmp_path / "tree"
+    (tree / ".venv" / "bin").mkdir(parents=True)
+    (tree / ".venv" / "bin" / "python").write_text("", encoding="utf-8")
+    (tree / "pkg.egg-info").mkdir()
+    (tree / "mod.py").write_text("x = 1\n", encoding="utf-8")
+    (tree / "alias.py").symlink_to("mod.py")
+    (tree / "dangling").symlink_to(tmp_path / "missing")
+
+    dest = _prepare_workspace(tmp_path / "work", tree)
+    assert dest == tmp_path / "work" / PACKAGE_NAME
+    assert sorted(p.name for p in dest.iterdir()) == ["alias.py", "dangling", "mod.py"]
+    assert (dest / "alias.py").is_symlink() and (dest / "dangling").is_symlink()
@@ -0,0 +1,68 @@
+"""Tests for the pipelined speculative loop."""
+
+import asyncio
+from pathlib import Path
+from typing import List, Optional
+
+import pytest
+
+from self_editing_ai.src.agent.loop import AgentLoop
+from self_editing_ai.src.agent.memory import Memory
+from self_editing_ai.src.agent.pipeline import Attempt, Candidate
+from self_editing_ai.src.agent.policies import PathMatcher
+from self_editing_ai.src.agent.snapshots import SnapshotStore
+from self_editing_ai.src.agent.workspace import Workspace
+
+
+def test_pipeline_accepts_and_cancels_speculation(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "tests").mkdir()
+    (tmp_path / "tests" / "test_value.py").write_text(
+        "def test_value():\n    assert open('value.txt').read() == 'good'\n", encoding="utf-8"
+    )
+    target = tmp_path / "value.txt"
+    target.write_text("bad", encoding="utf-8")
+    agent = AgentLoop(
+        memory=Memory(tmp_path / "memory.sqlite3"),
+        snapshots=SnapshotStore(tmp_path / ".snapshots"),
+        workspace=Workspace(PathMatcher([tmp_path], [])),
+    )
+    seen: List[int] = []
+
+    async def propose(goal: str, history: List[Attempt]) -> Optional[Candidate]:
+        seen.append(len(history))
+        await asyncio.sleep(0.05)
+        value = ["still bad", "good", "never tested"][len(history)]
+        return Candidate(files={str(target): value})
+
+    result = agent.run_pipelined("make it good", propose, max_steps=5, time_budget=60)
+
+    assert result.accepted is not None and result.accepted.step == 2
+    assert target.read_text(encoding="utf-8") == "good"
+    # Drafts 2 and 3 were started while the previous candidate was under test
+    assert seen == [0, 1, 2]
+    assert result.stats.drafts_used == 1
+    assert result.stats.drafts_wasted == 1
+
+
+def test_pipeline_reverts_on_step_budget(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "tests").mkdir()
+    (tmp_path / "tests" / "test_fail.py").write_text("def test_fail():\n    assert False\n", encoding="utf-8")
+    target = tmp_path / "value.txt"
+    target.write_text("original", encoding="utf-8")
+    agent = AgentLoop(
+        memory=Memory(tmp_path / "memory.sqlite3"),
+        snapshots=SnapshotStore(tmp_path / ".snapshots"),
+        workspace=Workspace(PathMatcher([tmp_path], [])),
+    )
+
+    async def propose(goal: str, history: List[Attempt]) -> Optional[Candidate]:
+        return Candidate(files={str(target): f"attempt {len(history)}"})
+
+    result = agent.run_pipelined("impossible", propose, max_steps=2, time_budget=60)
+
+    assert result.accepted is None
+    assert result.stop_reason == "step budget exhausted"
+    assert len(result.attempts) == 2
+    assert target.read_text(encoding="utf-8") == "original"
@@ -0,0 +1,89 @@
+"""Tests for the content‑addressed snapshot store."""
+
+from pathlib import Path
+
+import pytest
+
+from self_editing_ai.src.agent import policies, tools
+from self_editing_ai.src.agent.snapshots import SnapshotStore
+from self_editing_ai.src.agent.tools import atomic_write_many, write_file
+
+
+@pytest.fixture(autouse=True)
+def allow_tmp_path(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    # write_file goes through the policy‑checked default workspace
+    monkeypatch.setattr(policies, "ALLOWED_DIRS", [tmp_path])
+
+
+def test_snapshot_and_restore_exact_bytes(tmp_path: Path) -> None:
+    store = SnapshotStore(tmp_path / "store")
+    existing = tmp_path / "a.py"
+    existing.write_bytes(b"print('a')\r\n\x00")
+    created = tmp_path / "pkg" / "new.py"
+
+    snap = store.snapshot([existing, created])
+    write_file(existing, "changed")
+    write_file(created, "new file")
+
+    store.restore(snap.snapshot_id)
+    assert existing.read_bytes() == b"print('a')\r\n\x00"
+    assert not created.exists()
+
+
+def test_identical_contents_share_a_blob(tmp_path: Path) -> None:
+    store = SnapshotStore(tmp_path / "store")
+    files = {tmp_path / f"f{i}.txt": b"same" for i in range(3)}
+    atomic_write_many(files)
+    snap = store.snapshot(files)
+    assert len(set(snap.files.values())) == 1
+    assert len(list((tmp_path / "store" / "objects").rglob("*"))) == 2  # dir + blob
+
+
+def test_restore_with_missing_blob_leaves_tree_untouched(tmp_path: Path) -> None:
+    store = SnapshotStore(tmp_path / "store")
+    existing = tmp_path / "a.py"
+    existing.write_text("original", encoding="utf-8")
+    created = tmp_path / "new.py"
+
+    snap = store.snapshot([existing, created])
+    write_file(existing, "edited")
+    write_file(created, "new file")
+    store._blob_path(snap.files[str(existing.resolve())]).unlink()
+
+    with pytest.raises(FileNotFoundError):
+        store.restore(snap)
+    assert existing.read_text(encoding="utf-8") == "edited"
+    assert created.read_text(encoding="utf-8") == "new file"
+
+
+def test_revert_through_symlink_keeps_the_link(tmp_path: Path) -> None:
+    store = SnapshotStore(tmp_path / "store")
+    target = tmp_path / "real.py"
+    target.write_text("original", encoding="utf-8")
+    link = tmp_path / "link.py"
+    link.symlink_to(target)
+
+    snap = store.snapshot([link])
+    write_file(link, "edited")
+    assert link.is_symlink() and target.read_text(encoding="utf-8") == "edited"
+
+    store.restore(snap)
+    assert link.is_symlink()
+    assert link.read_text(encoding="utf-8") == "original"
+
+
+def test_failed_rename_removes_remaining_temporaries(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    files = {tmp_path / f"f{i}.txt": b"new" for i in range(3)}
+    real_replace = tools.os.replace
+    calls = []
+
+    def flaky_replace(src, dst):
+        calls.append(dst)
+        if len(calls) == 2:
+            raise OSError("disk gone")
+        real_replace(src, dst)
+
+    monkeypatch.setattr(tools.os, "replace", flaky_replace)
+    with pytest.raises(OSError):
+        atomic_write_many(files)
+    assert not list(tmp_path.glob(".*.tmp"))
@@ -0,0 +1,65 @@
+"""Tests for the bounded subprocess runner."""
+
+import sys
+import threading
+import time
+
+from self_editing_ai.src.agent.subprocess_runner import HeadTailBuffer, Limits, run_bounded
+
+
+def test_head_tail_buffer_elides_middle() -> None:
+    buf = HeadTailBuffer(head=4, tail=4)
+    for chunk in (b"abc", b"defghij", b"klmnop"):
+        buf.write(chunk)
+    assert buf.total == 16
+    assert buf.elided == 8
+    assert buf.getvalue() == "abcd\n... [8 bytes elided] ...\nmnop"
+
+
+def test_large_output_is_bounded() -> None:
+    code = "import sys\nfor i in range(200000): sys.stdout.write('x' * 50 + '\\n')\nprint('END')"
+    result = run_bounded([sys.executable, "-c", code], timeout=30, head_bytes=100, tail_bytes=100)
+    assert result.returncode == 0
+    assert result.total_bytes > 10_000_000
+    assert len(result.output) < 300
+    assert result.output.rstrip().endswith("END")
+    assert result.user_seconds > 0
+    assert result.usage()["total_bytes"] == result.total_bytes
+
+
+def test_timeout_kills_process_group() -> None:
+    code = (
+        "import subprocess, sys, time\n"
+        "subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(60)'])\n"
+        "time.sleep(60)"
+    )
+    start = time.perf_counter()
+    result = run_bounded([sys.executable, "-c", code], timeout=1)
+    assert result.timed_out
+    assert result.returncode is None
+    # The grandchild holds the pipe open; we must not wait for it
+    assert time.perf_counter() - start < 10
+
+
+def test_memory_limit_is_enforced() -> None:
+    code = "x = bytearray(512 * 1024 * 1024)"
+    result = run_bounded(
+        [sys.executable, "-c", code], timeout=30, limits=Limits(memory_bytes=256 * 1024 * 1024)
+    )
+    assert result.returncode != 0
+    assert "MemoryError" in result.output
+
+
+def test_limits_and_group_apply_when_started_from_a_thread() -> None:
+    code = "import os, resource; print(resource.getrlimit(resource.RLIMIT_NOFILE)[0], os.getpgid(0) == os.getpid())"
+    results = []
+    worker = threading.Thread(
+        target=lambda: results.append(
+            run_bounded([sys.executable, "-c", code], timeout=30, limits=Limits(max_open_files=64))
+        )
+    )
+    worker.start()
+    worker.join()
+    [result] = results
+    assert result.returncode == 0
+    assert result.output.split() == ["64", "True"]
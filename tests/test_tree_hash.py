@@ -0,0 +1,49 @@
+"""Tests for tree hashing and cached test outcomes."""
+
+from pathlib import Path
+
+import pytest
+
+from self_editing_ai.src import config
+from self_editing_ai.src.agent.memory import Memory
+from self_editing_ai.src.agent.tests_runner import outcome_cache_key, run_tests
+from self_editing_ai.src.agent.tree_hash import FileHashCache, tree_hash
+
+
+def test_tree_hash_tracks_content_and_reverts(tmp_path: Path) -> None:
+    (tmp_path / "pkg").mkdir()
+    mod = tmp_path / "pkg" / "mod.py"
+    mod.write_text("x = 1\n", encoding="utf-8")
+    (tmp_path / "memory.sqlite3").write_bytes(b"ignored")
+    cache = FileHashCache()
+
+    original = tree_hash([tmp_path], cache)
+    assert tree_hash([tmp_path], cache) == original
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    (tmp_path / "memory.sqlite3").write_bytes(b"still ignored")
+    assert tree_hash([tmp_path], cache) == original
+    (tmp_path / "data.json").write_text("{}", encoding="utf-8")
+    assert tree_hash([tmp_path], cache) != original
+    (tmp_path / "data.json").unlink()
+
+    mod.write_text("x = 2\n", encoding="utf-8")
+    assert tree_hash([tmp_path], cache) != original
+    mod.write_text("x = 1\n", encoding="utf-8")
+    assert tree_hash([tmp_path], cache) == original
+
+
+def test_tree_hash_ignores_configured_memory_db(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    db = tmp_path / "memory.db"
+    monkeypatch.setattr(config, "MEMORY_DB_PATH", db)
+    (tmp_path / "mod.py").write_text("x = 1\n", encoding="utf-8")
+    mem = Memory(db)
+    original = tree_hash([tmp_path], FileHashCache())
+    mem.append_message("user", "hello")
+    assert tree_hash([tmp_path], FileHashCache()) == original
+
+
+def test_run_tests_returns_cached_outcome(tmp_path: Path) -> None:
+    mem = Memory(tmp_path / "memory.sqlite3")
+    mem.put_test_result(outcome_cache_key(), True, "cached output")
+    assert run_tests(memory=mem) == (True, "cached output")
@@ -0,0 +1,77 @@
+"""Tests for the cached workspace file layer and path matcher."""
+
+from pathlib import Path
+
+import pytest
+
+from self_editing_ai.src.agent import policies
+from self_editing_ai.src.agent.policies import PathMatcher
+from self_editing_ai.src.agent.tools import read_file, write_file
+from self_editing_ai.src.agent.workspace import Workspace, default_workspace
+
+
+def make_workspace(root: Path) -> Workspace:
+    return Workspace(PathMatcher([root], ["*/secrets/*"]))
+
+
+def test_reads_are_cached_until_file_changes(tmp_path: Path) -> None:
+    ws = make_workspace(tmp_path)
+    target = tmp_path / "mod.py"
+    target.write_text("x = 1\n", encoding="utf-8")
+    assert ws.read(target) == "x = 1\n"
+    assert ws.read_many([target, target]) == {target: "x = 1\n"}
+    assert (ws.hits, ws.misses) == (2, 1)
+    assert not ws.dirty
+
+    target.write_text("x = 22\n", encoding="utf-8")
+    assert ws.read(target) == "x = 22\n"
+    assert ws.misses == 2
+    assert ws.dirty == {target}
+
+
+def test_writes_update_cache_and_dirty_set(tmp_path: Path) -> None:
+    ws = make_workspace(tmp_path)
+    a, b = tmp_path / "a.py", tmp_path / "pkg" / "b.py"
+    ws.write_many({a: "a", b: "b"})
+    assert ws.read(a) == "a" and ws.read(b) == "b"
+    assert ws.misses == 0
+    assert ws.mark_tested() == {a, b}
+    assert not ws.dirty
+
+
+def test_policy_is_enforced(tmp_path: Path) -> None:
+    ws = make_workspace(tmp_path / "root")
+    with pytest.raises(PermissionError):
+        ws.write(tmp_path / "outside.py", "nope")
+    with pytest.raises(PermissionError):
+        ws.write(tmp_path / "root" / "secrets" / "key.txt", "nope")
+    assert not (tmp_path / "outside.py").exists()
+
+
+def test_symlink_swapped_outside_is_denied(tmp_path: Path) -> None:
+    root = tmp_path / "root"
+    root.mkdir()
+    secret = tmp_path / "secret.txt"
+    secret.write_text("secret", encoding="utf-8")
+    target = root / "mod.py"
+    target.write_text("x = 1\n", encoding="utf-8")
+    ws = make_workspace(root)
+    assert ws.read(target) == "x = 1\n"
+
+    target.unlink()
+    target.symlink_to(secret)
+    with pytest.raises(PermissionError):
+        ws.read(target)
+
+
+def test_tools_go_through_default_workspace(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(policies, "ALLOWED_DIRS", [tmp_path])
+    ws = default_workspace()
+    target = tmp_path / "mod.py"
+    write_file(target, "x = 1\n")
+    hits = ws.hits
+    assert read_file(target) == "x = 1\n"
+    assert ws.hits == hits + 1
+    assert target in ws.dirty
+    with pytest.raises(PermissionError):
+        read_file(tmp_path.parent / "elsewhere.py")